@@ -9,15 +9,23 @@ Example:
 
 import argparse
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 from datetime import datetime, timezone
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
 
-def load_json(path: Path) -> List[Dict[str, Any]]:
+
+def load_json(path: str) -> List[Dict[str, Any]]:
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         if not isinstance(data, list):
             raise ValueError("JSON root is not a list")
         return data
@@ -29,31 +37,49 @@ def merge_json_files(in_dir: Path):
     merged: List[Dict[str, Any]] = []
     providers = set()
     sources = []
+    providers_add = providers.add
+    merged_append = merged.append
+
+    # One directory read; scandir entries carry the file type, so no per-file stat
+    with os.scandir(in_dir) as it:
+        entries = sorted(
+            (e.name, e.path)
+            for e in it
+            if e.name.endswith(".json")
+            and e.name not in ("all.json", "meta.json")
+            and not e.name.endswith("_meta.json")
+            and e.is_file()
+        )
+
+    # Overlap file reads and parsing; merging below stays sequential so output order is stable
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        loaded = list(ex.map(load_json, [path for _, path in entries]))
+
+    for (name, _), rows in zip(entries, loaded):
+        sources.append(name)
+
+        # fallback: infer provider from filename
+        inferred = name[: -len(".json")]
+        for r in rows:
+            prov = r.get("provider") or inferred
+            r["provider"] = prov
+            providers_add(str(prov))
+            merged_append(r)
 
-    for p in sorted(in_dir.glob("*.json")):
-        if p.name in ("all.json", "meta.json") or p.name.endswith("_meta.json"):
-            continue
-
-        rows = load_json(p)
-        sources.append(p.name)
+    return merged, sorted(providers), sources
 
-        for r in rows:
-            if "provider" in r and r["provider"]:
-                providers.add(str(r["provider"]))
-            else:
-                # fallback: infer provider from filename
-                inferred = p.stem
-                r["provider"] = inferred
-                providers.add(inferred)
 
-            merged.append(r)
+def _dump_json(path: Path, obj: Any) -> None:
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
 
-    return merged, sorted(providers), sources
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
 
 
 def write_all_json(path: Path, rows: List[Dict[str, Any]]) -> None:
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(rows, f, indent=2, ensure_ascii=False)
+    _dump_json(path, rows)
 
 
 def write_meta_json(
@@ -68,8 +94,7 @@ def write_meta_json(
         "providers": providers,
         "sources": sources,
     }
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(meta, f, indent=2, ensure_ascii=False)
+    _dump_json(path, meta)
 
 
 def main() -> None:
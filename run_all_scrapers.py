@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 """
-Wrapper script to run all GPU price scrapers serially.
+Wrapper script to run all GPU price scrapers concurrently.
 
 Imports scraper modules from the `sources` package and calls their scrape() functions.
+Each scrape is dominated by a single blocking HTTPS fetch, so the providers are
+dispatched on a thread pool and total wall time is roughly that of the slowest one.
 """
 
+import argparse
 import sys
-from datetime import datetime
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import scraper modules
 import sources.denvr
@@ -17,11 +19,51 @@ import sources.nebius
 import sources.crusoe
 import sources.lambdalabs
 
-sources.coreweave.scrape(url="https://www.coreweave.com/pricing", out_csv="data/coreweave_prices.csv", out_json="data/coreweave_prices.json")
-sources.nebius.scrape(url="https://nebius.com/prices", out_csv="data/nebius_prices.csv", out_json="data/nebius_prices.json")
-sources.denvr.scrape(url="https://www.denvr.com/pricing", out_csv="data/denvr_gpu_prices.csv", out_json="data/denvr_gpu_prices.json")
-sources.runpod.scrape(url="https://runpod.io/pricing", out_csv="data/runpod_gpu_prices.csv", out_json="data/runpod_gpu_prices.json")
-sources.crusoe.scrape(url="https://www.crusoe.ai/cloud/pricing", out_csv="data/crusoe_gpu_prices.csv", out_json="data/crusoe_gpu_prices.json")
-sources.lambdalabs.scrape(url="https://lambda.ai/pricing", out_csv="data/lambda_gpu_prices.csv", out_json="data/lambda_gpu_prices.json")
+# (module, url, out_csv, out_json)
+PROVIDERS = [
+    (sources.coreweave, "https://www.coreweave.com/pricing", "data/coreweave_prices.csv", "data/coreweave_prices.json"),
+    (sources.nebius, "https://nebius.com/prices", "data/nebius_prices.csv", "data/nebius_prices.json"),
+    (sources.denvr, "https://www.denvr.com/pricing", "data/denvr_gpu_prices.csv", "data/denvr_gpu_prices.json"),
+    (sources.runpod, "https://runpod.io/pricing", "data/runpod_gpu_prices.csv", "data/runpod_gpu_prices.json"),
+    (sources.crusoe, "https://www.crusoe.ai/cloud/pricing", "data/crusoe_gpu_prices.csv", "data/crusoe_gpu_prices.json"),
+    (sources.lambdalabs, "https://lambda.ai/pricing", "data/lambda_gpu_prices.csv", "data/lambda_gpu_prices.json"),
+]
 
 
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=len(PROVIDERS),
+        help="Number of scrapers to run at once (default: one per provider)",
+    )
+    args = ap.parse_args()
+    if args.jobs < 1:
+        ap.error("--jobs must be at least 1")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {
+            executor.submit(mod.scrape, url=url, out_csv=out_csv, out_json=out_json): mod.__name__
+            for mod, url, out_csv, out_json in PROVIDERS
+        }
+        # A failing provider is reported but does not abort its siblings
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                fut.result()
+            except Exception as e:
+                failed.append(name)
+                print(f"[FAIL] {name}: {e}", file=sys.stderr)
+            else:
+                print(f"[OK] {name}")
+
+    if failed:
+        print(f"{len(failed)} scraper(s) failed: {', '.join(sorted(failed))}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,16 @@
 """
 `sources` package initializer.
 
-This file exposes thin aliases for the scraper wrappers so callers can do:
+The scraper modules are imported on demand, so callers do:
 
     import sources.denvr
     import sources.runpod
 
+and each one can be run on its own with `python -m sources.runpod ...`. They are not
+imported here: runpy would otherwise find the module already loaded by the package and
+warn before executing it a second time.
+
 Each module (denvr.py, runpod.py, etc.) implements `scrape(url, out_csv, out_json)`.
 """
-from . import denvr
-from . import runpod
-from . import coreweave
-from . import nebius
-from . import crusoe
-from . import lambdalabs
 
 __all__ = ["denvr", "runpod", "coreweave", "nebius", "crusoe", "lambdalabs"]
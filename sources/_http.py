@@ -0,0 +1,144 @@
+"""
+Shared HTTP fetching for the scrapers, with an on-disk conditional-request cache.
+
+All requests go through one module-level requests.Session, so keep-alive connections
+(and their TLS sessions) are pooled per host and reused across retries and scrapers.
+
+A response is stored under CACHE_DIR (keyed by the SHA-256 of the URL) together with
+its ETag / Last-Modified validators only when the caller commit()s it, i.e. after
+scrape() has parsed the page and written its outputs. The commit also records a
+fingerprint (size, mtime) of the files the outputs depend on: the outputs themselves
+and the scraper module. The next fetch of that URL sends If-None-Match /
+If-Modified-Since; on a 304 the cached body is returned with `not_modified=True`, and
+is_current() tells scrape() whether its outputs still come from that body, so it can
+skip parsing. A fetch that is never committed (a failed parse, or the CLI loaders)
+leaves the cache untouched.
+
+Set GPU_PRICE_HTTP_CACHE to choose the cache directory, or to an empty string to disable it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CACHE_DIR = os.environ.get("GPU_PRICE_HTTP_CACHE", ".http_cache")
+
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 16
+
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=POOL_CONNECTIONS,
+    pool_maxsize=POOL_MAXSIZE,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+
+class Page(NamedTuple):
+    url: str
+    content: bytes
+    not_modified: bool = False
+    # Validators of this body (ETag / Last-Modified), saved by commit()
+    validators: Optional[Dict[str, str]] = None
+    # Fingerprints recorded by the last commit() of this body, checked by is_current()
+    files: Optional[Dict[str, List[int]]] = None
+
+
+def _cache_paths(url: str) -> Tuple[str, str]:
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    base = os.path.join(CACHE_DIR, key)
+    return base + ".body", base + ".json"
+
+
+def _load_cached(url: str) -> Tuple[Optional[bytes], Dict]:
+    if not CACHE_DIR:
+        return None, {}
+    body_path, meta_path = _cache_paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            return f.read(), meta
+    except (OSError, ValueError):
+        return None, {}
+
+
+def _fingerprints(paths) -> Optional[Dict[str, List[int]]]:
+    """(size, mtime_ns) per existing path; None if any of them is missing."""
+    out: Dict[str, List[int]] = {}
+    for path in paths:
+        if path is None:
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        out[os.path.abspath(path)] = [st.st_size, st.st_mtime_ns]
+    return out
+
+
+def is_current(page: Page, *paths: Optional[str]) -> bool:
+    """
+    True if `page` is an unchanged cached body and `paths` (outputs and the scraper module;
+    None entries are ignored) are exactly as they were when that body was committed.
+    """
+    if not page.not_modified or not page.files:
+        return False
+    return _fingerprints(paths) == page.files
+
+
+def commit(page: Page, *paths: Optional[str]) -> None:
+    """
+    Save `page` and its validators once its outputs in `paths` have been written,
+    so a later 304 can be trusted to mean those outputs are still current.
+    """
+    # Without a validator the server can never answer 304, so there is nothing worth keeping
+    if not CACHE_DIR or not page.validators:
+        return
+    files = _fingerprints(paths)
+    if files is None:
+        return
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    body_path, meta_path = _cache_paths(page.url)
+    meta = dict(page.validators, files=files)
+    # Write-then-rename so an interrupted run never leaves a truncated file behind;
+    # the body goes first so the metadata never describes a body that isn't there
+    for path, data in ((body_path, page.content), (meta_path, json.dumps(meta).encode("utf-8"))):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+
+def get(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30) -> Page:
+    """GET `url`, revalidating against the on-disk cache when we have a committed copy."""
+    req_headers = dict(headers or {})
+    cached, meta = _load_cached(url)
+    validators = {k: meta[k] for k in ("etag", "last_modified") if meta.get(k)}
+    if cached is not None:
+        if validators.get("etag"):
+            req_headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            req_headers["If-Modified-Since"] = validators["last_modified"]
+
+    r = SESSION.get(url, headers=req_headers, timeout=timeout)
+    if r.status_code == 304 and cached is not None:
+        return Page(url, cached, not_modified=True, validators=validators, files=meta.get("files"))
+    r.raise_for_status()
+
+    fresh = {
+        k: v
+        for k, v in (("etag", r.headers.get("ETag")), ("last_modified", r.headers.get("Last-Modified")))
+        if v
+    }
+    return Page(url, r.content, validators=fresh)
@@ -3,8 +3,8 @@
 CoreWeave GPU pricing scraper (from HTML source).
 
 Usage:
-  python coreweave_scraper.py --file /mnt/data/coreweaves.html
-  python coreweave_scraper.py --url  https://coreweave.com/gpu-cloud-pricing  --out-csv coreweave.csv --out-json coreweave.json
+  python -m sources.coreweave --file /mnt/data/coreweaves.html
+  python -m sources.coreweave --url  https://coreweave.com/gpu-cloud-pricing  --out-csv coreweave.csv --out-json coreweave.json
 """
 
 from __future__ import annotations
@@ -12,34 +12,40 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import os
 import re
 import sys
-from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional
-from urllib.request import Request, urlopen
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import List, Optional, Union
 
+import soupsieve as sv
 from bs4 import BeautifulSoup
 
+from . import _http
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
 
 # ----------------------------
 # I/O helpers
 # ----------------------------
-def load_html_from_file(path: str) -> str:
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+def load_html_from_file(path: str) -> bytes:
+    with open(path, "rb") as f:
         return f.read()
 
 
-def load_html_from_url(url: str, timeout_s: int = 30) -> str:
-    req = Request(
-        url,
-        headers={
-            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
-        },
-    )
-    with urlopen(req, timeout=timeout_s) as resp:
-        charset = resp.headers.get_content_charset() or "utf-8"
-        return resp.read().decode(charset, errors="ignore")
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+}
+
+
+def load_html_from_url(url: str, timeout_s: int = 30) -> bytes:
+    return _http.get(url, headers=_HEADERS, timeout=timeout_s).content
 
 
 # ----------------------------
@@ -47,10 +53,19 @@ def load_html_from_url(url: str, timeout_s: int = 30) -> str:
 # ----------------------------
 _PRICE_RE = re.compile(r"\$?\s*([0-9]+(?:\.[0-9]+)?)")
 _INT_RE = re.compile(r"^\s*([0-9][0-9,]*)\s*$")
+_WS_RE = re.compile(r"\s+")
+# Heuristic allowlist for GPU-ish rows (avoid CPU/network/etc.); expand as needed
+_GPU_KW_RE = re.compile(r"nvidia|a100|h100|h200|l40|l4|rtx|blackwell|gb200|gb300", re.IGNORECASE)
+
+# CSS selectors compiled once instead of re-parsed by soupsieve on every row
+_SEL_ROWS = sv.compile("div.table-row-v2.w-dyn-item")
+_SEL_GRID = sv.compile("div.table-grid")
+_SEL_NAME = sv.compile("h3.table-model-name")
+_SEL_CELLS = sv.compile(":scope > div.table-v2-cell")
 
 
 def _clean_text(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    return _WS_RE.sub(" ", (s or "").strip())
 
 
 def _parse_int(s: str) -> Optional[int]:
@@ -72,7 +87,7 @@ def _parse_float(s: str) -> Optional[float]:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class CoreWeaveGpuPriceRow:
     provider: str
     product: str
@@ -85,7 +100,11 @@ class CoreWeaveGpuPriceRow:
     raw_price: Optional[str] = None
 
 
-def parse_coreweave_gpu_pricing(html: str) -> List[Dict[str, Any]]:
+_FIELDS = tuple(f.name for f in fields(CoreWeaveGpuPriceRow))
+_row_values = attrgetter(*_FIELDS)
+
+
+def parse_coreweave_gpu_pricing(html: Union[bytes, str]) -> List[CoreWeaveGpuPriceRow]:
     """
     Extract GPU rows from CoreWeave pricing HTML.
 
@@ -96,43 +115,37 @@ def parse_coreweave_gpu_pricing(html: str) -> List[Dict[str, Any]]:
           subsequent div.table-v2-cell -> numeric columns
           last div.table-v2-cell -> "$.."
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
 
     rows: List[CoreWeaveGpuPriceRow] = []
+    clean = _clean_text
 
-    # Prefer the explicit GPU pricing rows on the page
-    candidate_rows = soup.select("div.table-row-v2.w-dyn-item.kubernetes-gpu-pricing")
-    if not candidate_rows:
-        # Fallback: anything that *looks* like GPU pricing rows (more permissive)
-        candidate_rows = soup.select("div.table-row-v2.w-dyn-item")
+    # Prefer the explicit GPU pricing rows on the page; fall back to anything that
+    # *looks* like GPU pricing rows (more permissive). One tree walk serves both.
+    candidate_rows = _SEL_ROWS.select(soup)
+    preferred = [r for r in candidate_rows if "kubernetes-gpu-pricing" in (r.get("class") or ())]
+    candidate_rows = preferred or candidate_rows
 
     for r in candidate_rows:
-        grid = r.select_one("div.table-grid")
+        grid = _SEL_GRID.select_one(r)
         if not grid:
             continue
 
-        name_el = grid.select_one("h3.table-model-name")
-        product = _clean_text(name_el.get_text(" ", strip=True)) if name_el else ""
+        name_el = _SEL_NAME.select_one(grid)
+        product = clean(name_el.get_text(" ", strip=True)) if name_el else ""
         if not product:
             continue
 
         # Heuristic: keep GPU-ish rows (avoid CPU/network/etc.)
-        # You can expand this allowlist as needed.
-        gpu_keywords = ("nvidia", "a100", "h100", "h200", "l40", "l4", "rtx", "blackwell", "gb200", "gb300")
-        if not any(k in product.lower() for k in gpu_keywords):
-            # If this row still has a $ price and a "GPU Count" style column count, allow it.
-            pass
+        # Rows without a keyword are still allowed below if they have a GPU count and VRAM.
+        is_gpu_product = _GPU_KW_RE.search(product) is not None
 
-        cells = grid.select(":scope > div.table-v2-cell")
+        cells = _SEL_CELLS.select(grid)
         if not cells or len(cells) < 2:
             continue
 
         # Extract visible cell texts in order (skip empty)
-        cell_texts: List[str] = []
-        for c in cells:
-            txt = _clean_text(c.get_text(" ", strip=True))
-            if txt:
-                cell_texts.append(txt)
+        cell_texts: List[str] = [t for c in cells if (t := clean(c.get_text(" ", strip=True)))]
 
         # Find price text (usually last; contains "$")
         raw_price = None
@@ -178,93 +191,60 @@ def parse_coreweave_gpu_pricing(html: str) -> List[Dict[str, Any]]:
 
         # Final heuristic gate: ensure it's actually GPU pricing
         # (avoid e.g., CPU table rows that also have $/hr)
-        if any(k in product.lower() for k in gpu_keywords) or (row_obj.gpu_count and row_obj.vram_gb):
+        if is_gpu_product or (row_obj.gpu_count and row_obj.vram_gb):
             rows.append(row_obj)
 
-    return [asdict(x) for x in rows]
+    return rows
 
 
 # ----------------------------
 # Outputs
 # ----------------------------
-def write_csv(path: str, rows: List[Dict[str, Any]]) -> None:
-    import os
-
+def write_csv(path: str, rows: List[CoreWeaveGpuPriceRow]) -> None:
     # 🔥 ensure directory exists
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-
-    if not rows:
-        fieldnames = [
-            "provider",
-            "product",
-            "gpu_count",
-            "vram_gb",
-            "vcpus",
-            "system_ram_gb",
-            "local_storage_tb",
-            "price_per_hour_usd",
-            "raw_price",
-        ]
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            csv.DictWriter(f, fieldnames=fieldnames).writeheader()
-        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
 
-    fieldnames = list(rows[0].keys())
+    # Header-only file when there are no rows, for consistency
     with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
-    if not rows:
-        # still emit a header-only file for consistency
-        fieldnames = [
-            "provider",
-            "product",
-            "gpu_count",
-            "vram_gb",
-            "vcpus",
-            "system_ram_gb",
-            "local_storage_tb",
-            "price_per_hour_usd",
-            "raw_price",
-        ]
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            csv.DictWriter(f, fieldnames=fieldnames).writeheader()
-        return
-
-    fieldnames = list(rows[0].keys())
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
-
+        w = csv.writer(f)
+        w.writerow(_FIELDS)
+        w.writerows(map(_row_values, rows))
 
-def write_json(path: str, rows: List[Dict[str, Any]]) -> None:
-    import os
 
+def write_json(path: str, rows: List[CoreWeaveGpuPriceRow]) -> None:
     # 🔥 ensure directory exists
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    if orjson is not None:
+        # orjson serializes dataclasses natively, no intermediate dicts
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(rows, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
 
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(rows, f, indent=2, ensure_ascii=False)
+        json.dump([dict(zip(_FIELDS, _row_values(r))) for r in rows], f, indent=2, ensure_ascii=False)
 
 # ----------------------------
 # CLI entrypoint (Lambda-style)
 # ----------------------------
-def scrape(url: str, out_csv: str, out_json: str):
+def scrape(url: str, out_csv: Optional[str], out_json: str):
     """
     Scrape CoreWeave GPU pricing from URL and write to CSV/JSON files.
     
     Args:
         url: URL to scrape
-        out_csv: Output CSV file path
+        out_csv: Output CSV file path, or None to write only the JSON
         out_json: Output JSON file path
     """
-    html = load_html_from_url(url)
-    rows = parse_coreweave_gpu_pricing(html)
-    write_csv(out_csv, rows)
+    page = _http.get(url, headers=_HEADERS)
+    if _http.is_current(page, __file__, out_csv, out_json):
+        # Page unchanged and the outputs are the ones written from it last run
+        return
+    rows = parse_coreweave_gpu_pricing(page.content)
+    if out_csv is not None:
+        write_csv(out_csv, rows)
     write_json(out_json, rows)
+    _http.commit(page, __file__, out_csv, out_json)
 
 
 def main() -> None:
@@ -3,22 +3,30 @@
 Scrape GPU prices from Crusoe pricing HTML (local file or live URL).
 
 Usage:
-  python scrape_crusoe_prices.py --file /mnt/data/cruso.html
-  python scrape_crusoe_prices.py --url  "https://www.crusoe.ai/cloud/pricing"
+  python -m sources.crusoe --file /mnt/data/cruso.html
+  python -m sources.crusoe --url  "https://www.crusoe.ai/cloud/pricing"
 """
 
 import argparse
 import csv
 import json
 import re
-from dataclasses import asdict, dataclass
-from typing import List, Optional
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import List, Optional, Union
 
-import requests
+import soupsieve as sv
 from bs4 import BeautifulSoup
 
+from . import _http
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+
+@dataclass(slots=True)
 class GpuPriceRow:
     provider: str
     product: str
@@ -30,52 +38,69 @@ class GpuPriceRow:
     price_per_hour_usd: Optional[float] = None
 
 
+_FIELDS = tuple(f.name for f in fields(GpuPriceRow))
+_row_values = attrgetter(*_FIELDS)
+
+
+_WS_RE = re.compile(r"\s+")
+_VRAM_RE = re.compile(r"(\d+(?:\.\d+)?)\s*GB")
+_PRICE_RE = re.compile(r"\$\s*(\d+(?:\.\d+)?)")
+
+# CSS selectors compiled once instead of re-parsed by soupsieve for every card
+_SEL_CARDS = sv.compile("div.pricing_gpu-item")
+_SEL_HEADING = sv.compile("h4.pricing-item-heading")
+_SEL_TAGS = sv.compile(".pricing_tags-wr .pricing-tag")
+_SEL_PRICES = sv.compile("div.pricing-rich p")
+
+
 def _clean_text(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "")).strip()
+    return _WS_RE.sub(" ", (s or "")).strip()
 
 
-def load_html_from_file(path: str) -> str:
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+def load_html_from_file(path: str) -> bytes:
+    with open(path, "rb") as f:
         return f.read()
 
 
-def load_html_from_url(url: str, timeout: int = 30) -> str:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; price-scraper/1.0; +https://example.com/bot)"
-    }
-    r = requests.get(url, headers=headers, timeout=timeout)
-    r.raise_for_status()
-    return r.text
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; price-scraper/1.0; +https://example.com/bot)"
+}
 
 
-def parse_gpu_prices(html: str, base_url: Optional[str] = None) -> List[GpuPriceRow]:
-    soup = BeautifulSoup(html, "html.parser")
+def load_html_from_url(url: str, timeout: int = 30) -> bytes:
+    return _http.get(url, headers=_HEADERS, timeout=timeout).content
+
+
+def parse_gpu_prices(html: Union[bytes, str], base_url: Optional[str] = None) -> List[GpuPriceRow]:
+    soup = BeautifulSoup(html, "lxml")
 
     rows: List[GpuPriceRow] = []
+    vram_search = _VRAM_RE.search
+    price_search = _PRICE_RE.search
 
     # Each GPU card looks like: <div class="pricing_gpu-item"> ... </div>
-    for card in soup.select("div.pricing_gpu-item"):
-        name_el = card.select_one("h4.pricing-item-heading")
+    for card in _SEL_CARDS.select(soup):
+        name_el = _SEL_HEADING.select_one(card)
         gpu_name = _clean_text(name_el.get_text()) if name_el else None
         if not gpu_name:
             continue
 
         # Extract VRAM from tags if available
         vram_gb = None
-        tags = [_clean_text(t.get_text()) for t in card.select(".pricing_tags-wr .pricing-tag") if _clean_text(t.get_text())]
+        tags = [_clean_text(t.get_text()) for t in _SEL_TAGS.select(card) if _clean_text(t.get_text())]
         for tag in tags:
             # Try to extract GB values like "186GB", "141GB"
-            match = re.search(r'(\d+(?:\.\d+)?)\s*GB', tag)
+            match = vram_search(tag)
             if match:
                 vram_gb = int(float(match.group(1)))
                 break
 
         # Extract price (first numeric price found)
         price_per_hour_usd = None
-        for p in card.select("div.pricing-rich p"):
+        for p in _SEL_PRICES.select(card):
             txt = _clean_text(p.get_text())
             if txt:
-                price_match = re.search(r'\$\s*(\d+(?:\.\d+)?)', txt)
+                price_match = price_search(txt)
                 if price_match:
                     price_per_hour_usd = float(price_match.group(1))
                     break
@@ -91,12 +116,21 @@ def parse_gpu_prices(html: str, base_url: Optional[str] = None) -> List[GpuPrice
 
 
 def write_csv(rows: List[GpuPriceRow], path: str) -> None:
-    fieldnames = ["provider", "product", "gpu_count", "vram_gb", "vcpus", "system_ram_gb", "local_storage_tb", "price_per_hour_usd"]
     with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(asdict(r))
+        w = csv.writer(f)
+        w.writerow(_FIELDS)
+        w.writerows(map(_row_values, rows))
+
+
+def write_json(rows: List[GpuPriceRow], path: str) -> None:
+    if orjson is not None:
+        # orjson serializes dataclasses natively, no intermediate dicts
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(rows, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([dict(zip(_FIELDS, _row_values(r))) for r in rows], f, indent=2, ensure_ascii=False)
 
 
 def main() -> None:
@@ -119,28 +153,31 @@ def main() -> None:
     rows = parse_gpu_prices(html, base_url=base_url)
 
     write_csv(rows, args.out_csv)
-    with open(args.out_json, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in rows], f, indent=2)
+    write_json(rows, args.out_json)
 
     print(f"Scraped {len(rows)} GPU rows")
     print(f"Wrote: {args.out_csv}, {args.out_json}")
 
 
-def scrape(url: str, out_csv: str, out_json: str):
+def scrape(url: str, out_csv: Optional[str], out_json: str):
     """
     Scrape Crusoe GPU pricing from URL and write to CSV/JSON files.
     
     Args:
         url: URL to scrape
-        out_csv: Output CSV file path
+        out_csv: Output CSV file path, or None to write only the JSON
         out_json: Output JSON file path
     """
-    html = load_html_from_url(url)
+    page = _http.get(url, headers=_HEADERS)
+    if _http.is_current(page, __file__, out_csv, out_json):
+        # Page unchanged and the outputs are the ones written from it last run
+        return
     base_url = url.split("/cloud/")[0] if "/cloud/" in url else None
-    rows = parse_gpu_prices(html, base_url=base_url)
-    write_csv(rows, out_csv)
-    with open(out_json, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in rows], f, indent=2)
+    rows = parse_gpu_prices(page.content, base_url=base_url)
+    if out_csv is not None:
+        write_csv(rows, out_csv)
+    write_json(rows, out_json)
+    _http.commit(page, __file__, out_csv, out_json)
 
 
 if __name__ == "__main__":
@@ -3,8 +3,8 @@
 Denvr GPU pricing scraper (Wix warmup JSON)
 
 Usage:
-  python denvr_scraper.py --file /mnt/data/denvr.html
-  python denvr_scraper.py --url  "https://www.denvr.com/pricing"
+  python -m sources.denvr --file /mnt/data/denvr.html
+  python -m sources.denvr --url  "https://www.denvr.com/pricing"
 
 Outputs:
   - denvr_gpu_prices.csv
@@ -17,17 +17,22 @@ import argparse
 import csv
 import json
 import re
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
-import requests
-from bs4 import BeautifulSoup
+from . import _http
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
 
 
 # ----------------------------
 # Data model
 # ----------------------------
-@dataclass
+@dataclass(slots=True)
 class DenvrGpuRow:
     provider: str = "denvr"
     product: str = ""
@@ -39,89 +44,97 @@ class DenvrGpuRow:
     price_per_hour_usd: Optional[float] = None
 
 
+_FIELDS = tuple(f.name for f in fields(DenvrGpuRow))
+_row_values = attrgetter(*_FIELDS)
+
+
 # ----------------------------
 # IO helpers
 # ----------------------------
-def load_html_from_file(path: str) -> str:
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+def load_html_from_file(path: str) -> bytes:
+    with open(path, "rb") as f:
         return f.read()
 
 
-def load_html_from_url(url: str, timeout_s: int = 30) -> str:
-    headers = {"User-Agent": "Mozilla/5.0 (compatible; gpu-price-scraper/1.0)"}
-    r = requests.get(url, headers=headers, timeout=timeout_s)
-    r.raise_for_status()
-    return r.text
+_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; gpu-price-scraper/1.0)"}
+
+
+def load_html_from_url(url: str, timeout_s: int = 30) -> bytes:
+    return _http.get(url, headers=_HEADERS, timeout=timeout_s).content
 
 
 # ----------------------------
 # Parser
 # ----------------------------
+# One pattern for every numeric field: optional "$", the number, optional size unit
+_NUM_UNIT_RE = re.compile(r"(?P<cur>\$)?\s*(?P<num>\d+(?:\.\d+)?)\s*(?P<unit>GB|TB|MB)?", re.IGNORECASE)
+# Matched against the raw response bytes so the page is never decoded or parsed into a DOM
+_WIX_RE = re.compile(rb"<script[^>]*\bid=[\"']wix-warmup-data[\"'][^>]*>(.*?)</script>", re.DOTALL | re.IGNORECASE)
+
+
+def _scan(s: Optional[str]) -> Iterator[Tuple[bool, float, str]]:
+    """Yield (has_dollar, value, unit) for each number in `s`, left to right, in a single pass"""
+    for m in _NUM_UNIT_RE.finditer(s or ""):
+        yield m["cur"] is not None, float(m["num"]), (m["unit"] or "").upper()
+
+
 def _parse_float(s: Optional[str]) -> Optional[float]:
     """Extract float from price string like '$1.25 / GPU'"""
-    if not s:
-        return None
-    match = re.search(r'\$\s*(\d+(?:\.\d+)?)', s)
-    if match:
-        try:
-            return float(match.group(1))
-        except ValueError:
-            return None
-    return None
+    return next((v for has_dollar, v, _ in _scan(s) if has_dollar), None)
 
 
 def _extract_vram_gb(vram_str: Optional[str]) -> Optional[float]:
     """Extract VRAM in GB from strings like '96 GB', '40 GB'"""
-    if not vram_str:
-        return None
-    match = re.search(r'(\d+(?:\.\d+)?)\s*GB', vram_str)
-    if match:
-        try:
-            return float(match.group(1))
-        except ValueError:
-            return None
+    for _, v, unit in _scan(vram_str):
+        if unit == "GB":
+            return v
+        if unit == "MB":
+            return v / 1024
     return None
 
 
 def _extract_int(s: Optional[str]) -> Optional[int]:
     """Extract integer from strings like '160', '64'"""
-    if not s:
-        return None
-    match = re.search(r'(\d+)', s)
-    if match:
-        try:
-            return int(match.group(1))
-        except ValueError:
-            return None
-    return None
+    return next((int(v) for _, v, _ in _scan(s)), None)
 
 
 def _extract_storage_tb(storage_str: Optional[str]) -> Optional[float]:
     """Extract storage in TB from strings like '4x 7.6TB NVMe'"""
-    if not storage_str:
-        return None
-    match = re.search(r'(\d+(?:\.\d+)?)\s*TB', storage_str)
-    if match:
-        try:
-            return float(match.group(1))
-        except ValueError:
-            return None
-    return None
+    return next((v for _, v, unit in _scan(storage_str) if unit == "TB"), None)
+
+
+def _coerce_int(v: Any) -> Optional[int]:
+    """Use numeric warmup values as-is; only strings go through the regex extractor"""
+    if isinstance(v, int):
+        return v
+    if isinstance(v, float):
+        return int(v)
+    return _extract_int(v) if isinstance(v, str) else None
 
 
-def _extract_wix_warmup_json(html: str) -> Dict[str, Any]:
-    soup = BeautifulSoup(html, "html.parser")
-    tag = soup.find("script", id="wix-warmup-data")
-    if not tag or not tag.string:
+def _coerce_float(v: Any, extract: Callable[[Optional[str]], Optional[float]]) -> Optional[float]:
+    """Like _coerce_int, with `extract` parsing the string form (price, VRAM, storage)"""
+    if isinstance(v, (int, float)):
+        return float(v)
+    return extract(v) if isinstance(v, str) else None
+
+
+def _extract_wix_warmup_json(html: Union[bytes, str]) -> Dict[str, Any]:
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    m = _WIX_RE.search(html)
+    if not m or not m.group(1).strip():
         raise ValueError("Could not find <script id='wix-warmup-data'> in HTML (is the page source complete?)")
 
     try:
-        return json.loads(tag.string)
+        if orjson is not None:
+            return orjson.loads(m.group(1))
+        return json.loads(m.group(1))
     except json.JSONDecodeError as e:
         raise ValueError(f"Failed to parse wix-warmup-data JSON: {e}") from e
 
 
-def parse_denvr_pricing(html: str) -> List[DenvrGpuRow]:
+def parse_denvr_pricing(html: Union[bytes, str]) -> List[DenvrGpuRow]:
     warmup = _extract_wix_warmup_json(html)
 
     # Expected path (seen in your denvr.html):
@@ -150,20 +163,25 @@ def parse_denvr_pricing(html: str) -> List[DenvrGpuRow]:
         if not title:
             continue
 
-        price = rec.get("price") or ""
-        
-        # Extract values from fields
-        gpu_count = rec.get("gpuCount")
-        if gpu_count and not isinstance(gpu_count, int):
-            gpu_count = _extract_int(str(gpu_count))
+        gpu_count = _coerce_int(rec.get("gpuCount"))
+        price = rec.get("price")
 
-        vram_gb = _extract_vram_gb(rec.get("gpuVram"))
-        vcpus = _extract_int(rec.get("vCpUs"))
-        system_ram_gb = _extract_int(rec.get("memory"))
-        local_storage_tb = _extract_storage_tb(rec.get("localStorage"))
-        price_per_hour_usd = _parse_float(price)
+        # De-dupe: title+gpuCount+price is typically stable. Keyed on the raw price so distinct
+        # offers that parse alike (e.g. "Contact sales" vs "Call us") stay separate rows;
+        # checked before the remaining fields are extracted
+        key = (title, gpu_count or 0, price or "")
+        if key in seen:
+            continue
+        seen.add(key)
+
+        # Extract values from fields (Wix stores some of these as numbers already)
+        vram_gb = _coerce_float(rec.get("gpuVram"), _extract_vram_gb)
+        vcpus = _coerce_int(rec.get("vCpUs"))
+        system_ram_gb = _coerce_int(rec.get("memory"))
+        local_storage_tb = _coerce_float(rec.get("localStorage"), _extract_storage_tb)
+        price_per_hour_usd = _coerce_float(price, _parse_float)
 
-        row = DenvrGpuRow(
+        rows.append(DenvrGpuRow(
             product=title,
             gpu_count=gpu_count,
             vram_gb=vram_gb,
@@ -171,15 +189,7 @@ def parse_denvr_pricing(html: str) -> List[DenvrGpuRow]:
             system_ram_gb=system_ram_gb,
             local_storage_tb=local_storage_tb,
             price_per_hour_usd=price_per_hour_usd,
-        )
-
-        # De-dupe: title+gpuCount+price is typically stable
-        key = (title, gpu_count or 0, price)
-        if key in seen:
-            continue
-        seen.add(key)
-
-        rows.append(row)
+        ))
 
     rows.sort(key=lambda r: (r.product, r.gpu_count or 0))
     return rows
@@ -189,35 +199,44 @@ def parse_denvr_pricing(html: str) -> List[DenvrGpuRow]:
 # Writers
 # ----------------------------
 def write_csv(path: str, rows: List[DenvrGpuRow]) -> None:
-    fieldnames = ["provider", "product", "gpu_count", "vram_gb", "vcpus", "system_ram_gb", "local_storage_tb", "price_per_hour_usd"]
     with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(asdict(r))
+        w = csv.writer(f)
+        w.writerow(_FIELDS)
+        w.writerows(map(_row_values, rows))
 
 
 def write_json(path: str, rows: List[DenvrGpuRow]) -> None:
+    if orjson is not None:
+        # orjson serializes dataclasses natively, no intermediate dicts
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(rows, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+
     with open(path, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in rows], f, indent=2, ensure_ascii=False)
+        json.dump([dict(zip(_FIELDS, _row_values(r))) for r in rows], f, indent=2, ensure_ascii=False)
 
 
 # ----------------------------
 # CLI entrypoint (Lambda-style)
 # ----------------------------
-def scrape(url: str, out_csv: str, out_json: str):
+def scrape(url: str, out_csv: Optional[str], out_json: str):
     """
     Scrape Denvr GPU pricing from URL and write to CSV/JSON files.
     
     Args:
         url: URL to scrape
-        out_csv: Output CSV file path
+        out_csv: Output CSV file path, or None to write only the JSON
         out_json: Output JSON file path
     """
-    html = load_html_from_url(url)
-    rows = parse_denvr_pricing(html)
-    write_csv(out_csv, rows)
+    page = _http.get(url, headers=_HEADERS)
+    if _http.is_current(page, __file__, out_csv, out_json):
+        # Page unchanged and the outputs are the ones written from it last run
+        return
+    rows = parse_denvr_pricing(page.content)
+    if out_csv is not None:
+        write_csv(out_csv, rows)
     write_json(out_json, rows)
+    _http.commit(page, __file__, out_csv, out_json)
 
 
 def main() -> None:
@@ -3,22 +3,31 @@
 Scrape GPU pricing tables from Lambda pricing HTML (local file or live URL).
 
 Usage:
-  python scrape_lambda_prices.py --file /mnt/data/lambda.html
-  python scrape_lambda_prices.py --url  "https://lambda.ai/pricing"
+  python -m sources.lambdalabs --file /mnt/data/lambda.html
+  python -m sources.lambdalabs --url  "https://lambda.ai/pricing"
 """
 
 import argparse
 import csv
 import json
 import re
-from dataclasses import asdict, dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from typing import ClassVar, Dict, List, Optional, Tuple, Union
 
-import requests
+import soupsieve as sv
 from bs4 import BeautifulSoup
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
 
-@dataclass
+from . import _http
+
+
+@dataclass(slots=True)
 class PricingRow:
     provider: str = "lambda"
     product: str = ""
@@ -26,15 +35,41 @@ class PricingRow:
     vram_gb: Optional[float] = None
     vcpus: Optional[int] = None
     system_ram_gb: Optional[int] = None
-    local_storage_tb: Optional[float] = None
+    # None for every provider here; kept class-level so rows don't carry a slot for it
+    local_storage_tb: ClassVar[None] = None
     price_per_hour_usd: Optional[float] = None
 
 
+# Unified schema column order; local_storage_tb is read off the class by attrgetter
+_FIELDS = (
+    "provider",
+    "product",
+    "gpu_count",
+    "vram_gb",
+    "vcpus",
+    "system_ram_gb",
+    "local_storage_tb",
+    "price_per_hour_usd",
+)
+_row_values = attrgetter(*_FIELDS)
+
+
+_FLOAT_RE = re.compile(r"[-+]?\d*\.?\d+")
+_INT_RE = re.compile(r"(\d+)")
+_VRAM_RE = re.compile(r"(\d+(?:\.\d+)?)\s*GB")
+_WS_RE = re.compile(r"\s+")
+_KEY_TOKEN_RE = re.compile(r"[a-z]+")
+
+_SEL_TABLES = sv.compile("table._pricingTable_z1nfw_13")
+_SEL_HEAD_CELLS = sv.compile("thead th")
+_SEL_BODY_ROWS = sv.compile("tbody tr")
+
+
 def _parse_float(s: Optional[str]) -> Optional[float]:
     """Extract float from price string like '$3.79' or '3.79'"""
     if not s:
         return None
-    match = re.search(r'[-+]?\d*\.?\d+', s)
+    match = _FLOAT_RE.search(s)
     if match:
         try:
             return float(match.group(0))
@@ -47,7 +82,7 @@ def _extract_vram_gb(s: Optional[str]) -> Optional[float]:
     """Extract VRAM from strings like '141 GB VRAM'"""
     if not s:
         return None
-    match = re.search(r'(\d+(?:\.\d+)?)\s*GB', s)
+    match = _VRAM_RE.search(s)
     if match:
         try:
             return float(match.group(1))
@@ -60,7 +95,13 @@ def _extract_int(s: Optional[str]) -> Optional[int]:
     """Extract integer from strings"""
     if not s:
         return None
-    match = re.search(r'(\d+)', s)
+    # Fast path: cells like "208" are already plain integers
+    if s.isdigit():
+        try:
+            return int(s)
+        except ValueError:  # digit-like characters such as superscripts
+            pass
+    match = _INT_RE.search(s)
     if match:
         try:
             return int(match.group(1))
@@ -69,6 +110,30 @@ def _extract_int(s: Optional[str]) -> Optional[int]:
     return None
 
 
+# Header token (singular; a trailing "s" is dropped before lookup) -> normalized field
+_KEY_ALIASES = {
+    "price": "price_per_hour_usd",
+    "cost": "price_per_hour_usd",
+    "vram": "vram_gb",
+    "memory": "vram_gb",
+    "vcpu": "vcpus",
+    "cpu": "vcpus",
+}
+# Order in which a header's candidate fields are tried; "gpu" + "count" adds gpu_count
+_FIELD_ORDER = ("price_per_hour_usd", "vram_gb", "vcpus", "gpu_count")
+
+
+@lru_cache(maxsize=None)
+def _fields_for_key(key: str) -> Tuple[str, ...]:
+    """Candidate PricingRow fields for a column header like 'Price/GPU/hr' or 'VRAM/GPU', in _FIELD_ORDER"""
+    # Fold plurals ("Prices", "vCPUs", "GPUs") onto the singular tokens used below
+    tokens = {t[:-1] if t.endswith("s") else t for t in _KEY_TOKEN_RE.findall(key.lower())}
+    matched = {_KEY_ALIASES[t] for t in tokens if t in _KEY_ALIASES}
+    if "gpu" in tokens and "count" in tokens:
+        matched.add("gpu_count")
+    return tuple(f for f in _FIELD_ORDER if f in matched)
+
+
 def _extract_normalized_fields(plan_text: Optional[str], fields: Dict[str, str]) -> tuple:
     """
     Extract normalized fields from Lambda pricing table.
@@ -83,103 +148,62 @@ def _extract_normalized_fields(plan_text: Optional[str], fields: Dict[str, str])
     system_ram_gb = None
     price_per_hour_usd = None
 
-    # Try to extract from fields dict
+    # Try to extract from fields dict. A header's candidates are tried in order and the
+    # first one that is still unset (and, for VRAM, has a GB value) takes the cell
     for key, val in fields.items():
-        key_lower = key.lower()
-        
-        # Price field (look for anything with "price" or "$")
-        if ("price" in key_lower or "cost" in key_lower) and price_per_hour_usd is None:
-            price_per_hour_usd = _parse_float(val)
-        
-        # VRAM field
-        elif ("vram" in key_lower or "memory" in key_lower) and vram_gb is None and "gb" in val.lower():
-            vram_gb = _extract_vram_gb(val)
-        
-        # vCPU field
-        elif ("vcpu" in key_lower or "cpu" in key_lower) and vcpus is None:
-            vcpus = _extract_int(val)
-        
-        # GPU count field
-        elif ("gpu" in key_lower and "count" in key_lower) and gpu_count is None:
-            gpu_count = _extract_int(val)
+        for field in _fields_for_key(key):
+            if field == "price_per_hour_usd":
+                if price_per_hour_usd is None:
+                    price_per_hour_usd = _parse_float(val)
+                    break
+            elif field == "vram_gb":
+                if vram_gb is None and "gb" in val.lower():
+                    vram_gb = _extract_vram_gb(val)
+                    break
+            elif field == "vcpus":
+                if vcpus is None:
+                    vcpus = _extract_int(val)
+                    break
+            elif gpu_count is None:
+                gpu_count = _extract_int(val)
+                break
 
     return product, gpu_count, vram_gb, vcpus, system_ram_gb, price_per_hour_usd
 
 
-def load_html_from_file(path: str) -> str:
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+def load_html_from_file(path: str) -> bytes:
+    with open(path, "rb") as f:
         return f.read()
 
 
-def load_html_from_url(url: str, timeout: int = 30) -> str:
-    headers = {"User-Agent": "Mozilla/5.0 (compatible; price-scraper/1.0)"}
-    r = requests.get(url, headers=headers, timeout=timeout)
-    r.raise_for_status()
-    return r.text
-
-
-def _clean(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
-
-
-def _nearest_section_title(node) -> str:
-    """
-    Walk up to find the closest preceding/ancestor H2 that names the pricing section
-    (e.g., 'Instances pricing', '1-Click Clusters pricing').
-    """
-    # Try within the same section first
-    sec = node.find_parent("section")
-    if sec:
-        h2 = sec.select_one("h2")
-        if h2 and _clean(h2.get_text()):
-            return _clean(h2.get_text())
-
-    # Fallback: scan backwards in the document for the last h2 before this table
-    for prev in node.find_all_previous(["h2"]):
-        txt = _clean(prev.get_text())
-        if txt:
-            return txt
-
-    return "Pricing"
+_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; price-scraper/1.0)"}
 
 
-def _tab_label_for_table(table) -> Optional[str]:
-    """
-    Lambda page uses tab panels with aria-labelledby="tab-X". We can map that to button text.
-    """
-    panel = table.find_parent(attrs={"role": "tabpanel"})
-    if not panel:
-        return None
+def load_html_from_url(url: str, timeout: int = 30) -> bytes:
+    return _http.get(url, headers=_HEADERS, timeout=timeout).content
 
-    labelledby = panel.get("aria-labelledby")
-    if not labelledby:
-        return None
 
-    soup = table if isinstance(table, BeautifulSoup) else table.find_parent()
-    # "soup" may not be root; use the document root for lookup
-    root = table.find_parent("html") or table.find_parent() or table
-    btn = root.find(id=labelledby)
-    if btn:
-        t = _clean(btn.get_text())
-        return t or None
-    return None
+def _clean(s: str) -> str:
+    s = s.strip() if s else ""
+    # Most cells are already single-spaced; only enter the regex when there is a run to collapse
+    # or any whitespace besides the ASCII space (all of which str.isprintable() rejects)
+    if "  " in s or not s.isprintable():
+        return _WS_RE.sub(" ", s)
+    return s
 
 
-def parse_lambda_pricing(html: str) -> List[PricingRow]:
-    soup = BeautifulSoup(html, "html.parser")
+def parse_lambda_pricing(html: Union[bytes, str]) -> List[PricingRow]:
+    soup = BeautifulSoup(html, "lxml")
     rows: List[PricingRow] = []
 
     # Lambda tables in the saved HTML are rendered as <table class="_pricingTable_z1nfw_13">
-    for table in soup.select("table._pricingTable_z1nfw_13"):
-        section_title = _nearest_section_title(table)
-        tab_label = _tab_label_for_table(table)
-
+    for table in _SEL_TABLES.select(soup):
         # Extract header names in order (helps when data-label is missing)
         headers = []
-        for th in table.select("thead th"):
+        for th in _SEL_HEAD_CELLS.select(table):
             headers.append(_clean(th.get_text()))
 
-        for tr in table.select("tbody tr"):
+        for tr in _SEL_BODY_ROWS.select(table):
             # Each row has a "plan" in the first TH (often duplicated by data-plan attr)
             plan_text = None
             th0 = tr.find("th")
@@ -204,11 +228,9 @@ def parse_lambda_pricing(html: str) -> List[PricingRow]:
                     else:
                         key = f"col_{idx}"
 
-                # Avoid overwriting if repeated
-                if key in fields and fields[key] != val:
+                # Avoid overwriting if repeated: a differing value goes under an index-suffixed key
+                if fields.setdefault(key, val) != val:
                     fields[f"{key}_{idx}"] = val
-                else:
-                    fields[key] = val
 
             # Extract normalized fields
             product, gpu_count, vram_gb, vcpus, system_ram_gb, price_per_hour_usd = _extract_normalized_fields(plan_text, fields)
@@ -227,16 +249,26 @@ def parse_lambda_pricing(html: str) -> List[PricingRow]:
     return rows
 
 
-def write_csv(rows: List[PricingRow], path: str) -> None:
+def write_csv(values: List[tuple], path: str) -> None:
     """
-    Write pricing rows to standardized CSV format.
+    Write pricing rows, flattened to _FIELDS tuples (see _row_values), to standardized CSV format.
     """
-    fieldnames = ["provider", "product", "gpu_count", "vram_gb", "vcpus", "system_ram_gb", "local_storage_tb", "price_per_hour_usd"]
     with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(asdict(r))
+        w = csv.writer(f)
+        w.writerow(_FIELDS)
+        w.writerows(values)
+
+
+def write_json(values: List[tuple], path: str) -> None:
+    # Build the dicts from _FIELDS: dataclass serialization would drop the ClassVar column
+    records = [dict(zip(_FIELDS, v)) for v in values]
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
 
 
 def scrape(url: str, out_csv: str, out_json: str):
@@ -248,11 +280,16 @@ def scrape(url: str, out_csv: str, out_json: str):
         out_csv: Output CSV file path
         out_json: Output JSON file path
     """
-    html = load_html_from_url(url)
-    rows = parse_lambda_pricing(html)
-    write_csv(rows, out_csv)
-    with open(out_json, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in rows], f, indent=2, ensure_ascii=False)
+    page = _http.get(url, headers=_HEADERS)
+    if _http.is_current(page, __file__, out_csv, out_json):
+        # Page unchanged and the outputs are the ones written from it last run
+        return
+    rows = parse_lambda_pricing(page.content)
+    # Flatten each row once and hand the same tuples to both writers
+    values = list(map(_row_values, rows))
+    write_csv(values, out_csv)
+    write_json(values, out_json)
+    _http.commit(page, __file__, out_csv, out_json)
 
 
 def main() -> None:
@@ -268,9 +305,9 @@ def main() -> None:
 
     rows = parse_lambda_pricing(html)
 
-    write_csv(rows, args.out_csv)
-    with open(args.out_json, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in rows], f, indent=2, ensure_ascii=False)
+    values = list(map(_row_values, rows))
+    write_csv(values, args.out_csv)
+    write_json(values, args.out_json)
 
     print(f"Scraped {len(rows)} rows")
     print(f"Wrote: {args.out_csv}, {args.out_json}")
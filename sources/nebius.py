@@ -3,8 +3,8 @@
 Nebius GPU pricing scraper (from HTML page source)
 
 Usage:
-  python nebius_scraper.py --file /mnt/data/nebius.html
-  python nebius_scraper.py --url  "https://nebius.com/pricing/gpu"   # example
+  python -m sources.nebius --file /mnt/data/nebius.html
+  python -m sources.nebius --url  "https://nebius.com/pricing/gpu"   # example
 """
 
 from __future__ import annotations
@@ -13,17 +13,27 @@ import argparse
 import csv
 import json
 import re
-from dataclasses import asdict, dataclass
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from typing import ClassVar, List, Optional, Union
 
-import requests
-from bs4 import BeautifulSoup
+import lxml.html
+from bs4 import UnicodeDammit
+from lxml import etree
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+from . import _http
 
 
 # ----------------------------
 # Data model
 # ----------------------------
-@dataclass
+@dataclass(slots=True)
 class NebiusGpuRow:
     provider: str
     product: str
@@ -31,37 +41,63 @@ class NebiusGpuRow:
     vram_gb: Optional[float] = None
     vcpus: Optional[int] = None
     system_ram_gb: Optional[int] = None
-    local_storage_tb: Optional[float] = None
+    # None for every provider here; kept class-level so rows don't carry a slot for it
+    local_storage_tb: ClassVar[None] = None
     price_per_hour_usd: Optional[float] = None
 
 
+# Unified schema column order; local_storage_tb is read off the class by attrgetter
+_FIELDS = (
+    "provider",
+    "product",
+    "gpu_count",
+    "vram_gb",
+    "vcpus",
+    "system_ram_gb",
+    "local_storage_tb",
+    "price_per_hour_usd",
+)
+_row_values = attrgetter(*_FIELDS)
+
+
 # ----------------------------
 # I/O helpers
 # ----------------------------
-def load_html_from_file(path: str) -> str:
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+def load_html_from_file(path: str) -> bytes:
+    with open(path, "rb") as f:
         return f.read()
 
 
-def load_html_from_url(url: str, timeout_s: int = 30) -> str:
-    headers = {"User-Agent": "Mozilla/5.0 (compatible; gpu-price-scraper/1.0)"}
-    r = requests.get(url, headers=headers, timeout=timeout_s)
-    r.raise_for_status()
-    return r.text
+_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; gpu-price-scraper/1.0)"}
+
+
+def load_html_from_url(url: str, timeout_s: int = 30) -> bytes:
+    return _http.get(url, headers=_HEADERS, timeout=timeout_s).content
 
 
 # ----------------------------
-# Parser (DOM-based)
+# Parser (lxml + XPath)
 # ----------------------------
+_FLOAT_RE = re.compile(r"[-+]?\d*\.?\d+")
+_INT_RE = re.compile(r"(\d+)")
+_VRAM_RE = re.compile(r"(\d+(?:\.\d+)?)\s*GB")
+_WS_RE = re.compile(r"\s+")
+
+
 def _clean(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    s = s.strip() if s else ""
+    # Most cells are already single-spaced; only enter the regex when there is a run to collapse
+    # or any whitespace besides the ASCII space (all of which str.isprintable() rejects)
+    if "  " in s or not s.isprintable():
+        return _WS_RE.sub(" ", s)
+    return s
 
 
 def _parse_float(s: Optional[str]) -> Optional[float]:
     """Extract float from price string like '$5.50' or '5.50'"""
     if not s:
         return None
-    match = re.search(r'[-+]?\d*\.?\d+', s)
+    match = _FLOAT_RE.search(s)
     if match:
         try:
             return float(match.group(0))
@@ -74,7 +110,13 @@ def _extract_int(s: Optional[str]) -> Optional[int]:
     """Extract integer from strings"""
     if not s:
         return None
-    match = re.search(r'(\d+)', s)
+    # Fast path: cells like "208" are already plain integers
+    if s.isdigit():
+        try:
+            return int(s)
+        except ValueError:  # digit-like characters such as superscripts
+            pass
+    match = _INT_RE.search(s)
     if match:
         try:
             return int(match.group(1))
@@ -83,26 +125,31 @@ def _extract_int(s: Optional[str]) -> Optional[int]:
     return None
 
 
+# Common patterns for GPU VRAM. Longer names go first so the alternation
+# prefers e.g. GB200 over B200 and L40S over L40 at the same position.
+_VRAM_TABLE = [
+    ("GB200", 186),
+    ("B200", 180),
+    ("H200", 141),
+    ("H100", 80),
+    ("A100", 80),
+    ("L40S", 48),
+    ("L40", 48),
+    ("RTX PRO", 48),
+]
+_VRAM_ALT = re.compile("|".join(re.escape(k) for k, _ in _VRAM_TABLE), re.IGNORECASE)
+_VRAM_LOOKUP = {k.upper(): v for k, v in _VRAM_TABLE}
+
+
+@lru_cache(maxsize=256)
 def _extract_vram_from_product(product: str) -> Optional[float]:
     """Extract VRAM from product name like 'NVIDIA GB200 NVL72*' which has 186GB"""
-    # Common patterns for GPU VRAM
-    vram_patterns = {
-        "GB200": 186,
-        "B200": 180,
-        "H200": 141,
-        "H100": 80,
-        "A100": 80,
-        "L40S": 48,
-        "L40": 48,
-        "RTX PRO": 48,
-    }
-    
-    for pattern, vram in vram_patterns.items():
-        if pattern.upper() in product.upper():
-            return float(vram)
-    
+    m = _VRAM_ALT.search(product)
+    if m:
+        return float(_VRAM_LOOKUP[m.group(0).upper()])
+
     # Fallback: try to extract from string
-    match = re.search(r'(\d+(?:\.\d+)?)\s*GB', product)
+    match = _VRAM_RE.search(product)
     if match:
         try:
             return float(match.group(1))
@@ -112,38 +159,60 @@ def _extract_vram_from_product(product: str) -> Optional[float]:
     return None
 
 
-def parse_nebius_pricing(html: str, table_title: str = "NVIDIA GPU Instances") -> List[NebiusGpuRow]:
-    soup = BeautifulSoup(html, "html.parser")
-
-    # Find the highlight-table-block with the right title
-    target_block = None
-    for block in soup.select("div.pc-highlight-table-block"):
-        title_el = block.select_one("div.pc-highlight-table-block__title span.pc-title-item__text")
-        if title_el and _clean(title_el.get_text()) == table_title:
-            target_block = block
-            break
-
-    if not target_block:
-        titles = [
-            _clean(t.get_text())
-            for t in soup.select("div.pc-highlight-table-block__title span.pc-title-item__text")
-        ]
+def _cls(name: str) -> str:
+    """XPath predicate matching a whole class token, like CSS `.name`"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _text(el) -> str:
+    """Whitespace-collapsed text content, like BeautifulSoup's get_text(" ", strip=True)"""
+    return _clean(" ".join(el.itertext()))
+
+
+# Compiled once at import; calling an etree.XPath object skips re-parsing the expression
+_TITLE_PATH = f"div[{_cls('pc-highlight-table-block__title')}]//span[{_cls('pc-title-item__text')}]"
+_TITLES_XPATH = etree.XPath(f"//{_TITLE_PATH}")
+_BLOCKS_XPATH = etree.XPath(f"//div[{_cls('pc-highlight-table-block')}]")
+_BLOCK_TITLES_XPATH = etree.XPath(f".//{_TITLE_PATH}")
+_HEAD_CELLS_XPATH = etree.XPath(
+    f".//div[{_cls('pc-highlight-table-block__head')}]//div[{_cls('pc-highlight-table-block__cell')}]"
+)
+_BODY_ROWS_XPATH = etree.XPath(
+    f".//div[{_cls('pc-highlight-table-block__body')}]//div[{_cls('pc-highlight-table-block__row')}]"
+)
+_CELLS_XPATH = etree.XPath(f".//div[{_cls('pc-highlight-table-block__cell')}]")
+
+
+def parse_nebius_pricing(html: Union[bytes, str], table_title: str = "NVIDIA GPU Instances") -> List[NebiusGpuRow]:
+    if isinstance(html, bytes):
+        # lxml.html falls back to Latin-1 for bytes without a <meta charset>; decode first,
+        # trying the declared encoding, then UTF-8, like the BeautifulSoup scrapers do
+        html = UnicodeDammit(html, user_encodings=["utf-8"], is_html=True).unicode_markup
+    doc = lxml.html.fromstring(html)
+
+    # Find the highlight-table-block with the right title. The titles are compared after
+    # _clean() rather than with XPath normalize-space(), which leaves &nbsp; and other
+    # non-ASCII whitespace unfolded
+    wanted = _clean(table_title)
+    target_block = next(
+        (b for b in _BLOCKS_XPATH(doc) if any(_text(t) == wanted for t in _BLOCK_TITLES_XPATH(b))),
+        None,
+    )
+    if target_block is None:
+        titles = [_text(t) for t in _TITLES_XPATH(doc)]
         raise ValueError(
             f"Could not find table titled '{table_title}'. "
             f"Tables found: {titles or 'none'}"
         )
 
     # Extract header (optional validation / mapping)
-    headers = [
-        _clean(c.get_text(" ", strip=True))
-        for c in target_block.select("div.pc-highlight-table-block__head div.pc-highlight-table-block__cell")
-    ]
+    headers = [_text(c) for c in _HEAD_CELLS_XPATH(target_block)]
     # Expected: ["Item","vCPUs","RAM, GB","Price per GPU-hour"]
     # But we won't hard-fail if they tweak text slightly.
 
     rows: List[NebiusGpuRow] = []
-    for r in target_block.select("div.pc-highlight-table-block__body div.pc-highlight-table-block__row"):
-        cells = [_clean(c.get_text(" ", strip=True)) for c in r.select("div.pc-highlight-table-block__cell")]
+    for r in _BODY_ROWS_XPATH(target_block):
+        cells = [_text(c) for c in _CELLS_XPATH(r)]
         if len(cells) < 4:
             continue
 
@@ -182,18 +251,24 @@ def parse_nebius_pricing(html: str, table_title: str = "NVIDIA GPU Instances") -
 # ----------------------------
 # Writers
 # ----------------------------
-def write_csv(path: str, rows: List[NebiusGpuRow]) -> None:
-    fieldnames = ["provider", "product", "gpu_count", "vram_gb", "vcpus", "system_ram_gb", "local_storage_tb", "price_per_hour_usd"]
+def write_csv(path: str, values: List[tuple]) -> None:
+    # `values`: rows flattened to _FIELDS tuples (see _row_values), shared with write_json
     with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(asdict(r))
+        w = csv.writer(f)
+        w.writerow(_FIELDS)
+        w.writerows(values)
+
 
+def write_json(path: str, values: List[tuple]) -> None:
+    # Build the dicts from _FIELDS: dataclass serialization would drop the ClassVar column
+    records = [dict(zip(_FIELDS, v)) for v in values]
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
 
-def write_json(path: str, rows: List[NebiusGpuRow]) -> None:
     with open(path, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in rows], f, indent=2, ensure_ascii=False)
+        json.dump(records, f, indent=2, ensure_ascii=False)
 
 
 # ----------------------------
@@ -209,10 +284,16 @@ def scrape(url: str, out_csv: str, out_json: str, title: str = "NVIDIA GPU Insta
         out_json: Output JSON file path
         title: Table title to scrape (default: "NVIDIA GPU Instances")
     """
-    html = load_html_from_url(url)
-    rows = parse_nebius_pricing(html, table_title=title)
-    write_csv(out_csv, rows)
-    write_json(out_json, rows)
+    page = _http.get(url, headers=_HEADERS)
+    if _http.is_current(page, __file__, out_csv, out_json):
+        # Page unchanged and the outputs are the ones written from it last run
+        return
+    rows = parse_nebius_pricing(page.content, table_title=title)
+    # Flatten each row once and hand the same tuples to both writers
+    values = list(map(_row_values, rows))
+    write_csv(out_csv, values)
+    write_json(out_json, values)
+    _http.commit(page, __file__, out_csv, out_json)
 
 
 def main() -> None:
@@ -232,8 +313,9 @@ def main() -> None:
     html = load_html_from_file(args.file) if args.file else load_html_from_url(args.url)
     rows = parse_nebius_pricing(html, table_title=args.title)
 
-    write_csv(args.out_csv, rows)
-    write_json(args.out_json, rows)
+    values = list(map(_row_values, rows))
+    write_csv(args.out_csv, values)
+    write_json(args.out_json, values)
 
     print(f"Scraped {len(rows)} rows")
     print(f"Wrote: {args.out_csv}, {args.out_json}")
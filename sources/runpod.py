@@ -3,8 +3,8 @@
 RunPod GPU Pricing Scraper
 
 Usage:
-  python runpod_scraper.py --file /path/to/runpod.html
-  python runpod_scraper.py --url https://www.runpod.io/pricing
+  python -m sources.runpod --file /path/to/runpod.html
+  python -m sources.runpod --url https://www.runpod.io/pricing
 
 Outputs:
   - runpod_gpu_prices.csv
@@ -17,40 +17,52 @@ import argparse
 import csv
 import json
 import re
-from dataclasses import asdict, dataclass
-from typing import Any, Dict, List, Optional
-from urllib.request import Request, urlopen
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from bs4 import BeautifulSoup
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional speedup; fall back to BeautifulSoup
+    LexborHTMLParser = None
+
+from . import _http
 
 
 # ----------------------------
 # IO helpers
 # ----------------------------
-def load_html_from_file(path: str) -> str:
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+def load_html_from_file(path: str) -> bytes:
+    with open(path, "rb") as f:
         return f.read()
 
 
-def load_html_from_url(url: str, timeout_s: int = 30) -> str:
-    req = Request(
-        url,
-        headers={
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/122.0.0.0 Safari/537.36"
-            )
-        },
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/122.0.0.0 Safari/537.36"
     )
-    with urlopen(req, timeout=timeout_s) as resp:
-        return resp.read().decode("utf-8", errors="ignore")
+}
+
+
+def load_html_from_url(url: str, timeout_s: int = 30) -> bytes:
+    return _http.get(url, headers=_HEADERS, timeout=timeout_s).content
 
 
 # ----------------------------
 # Parsing helpers
 # ----------------------------
 _NUM_RE = re.compile(r"[-+]?\d*\.?\d+")
+_WS_RE = re.compile(r"\s+")
 
 
 def _to_float(x: Optional[str]) -> Optional[float]:
@@ -59,6 +71,12 @@ def _to_float(x: Optional[str]) -> Optional[float]:
     x = x.strip()
     if not x:
         return None
+    # Fast path: price attributes like data-secure-cloud-price="0.39" are already plain numbers
+    if x.replace(".", "", 1).isdigit():
+        try:
+            return float(x)
+        except ValueError:  # digit-like characters such as superscripts
+            pass
     m = _NUM_RE.search(x)
     if not m:
         return None
@@ -69,10 +87,15 @@ def _to_float(x: Optional[str]) -> Optional[float]:
 
 
 def _clean_text(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    s = s.strip() if s else ""
+    # Most cells are already single-spaced; only enter the regex when there is a run to collapse
+    # or any whitespace besides the ASCII space (all of which str.isprintable() rejects)
+    if "  " in s or not s.isprintable():
+        return _WS_RE.sub(" ", s)
+    return s
 
 
-def _parse_tags(tag_divs) -> Dict[str, str]:
+def _parse_tags(tag_parts: Iterable[List[str]]) -> Dict[str, str]:
     """
     RunPod rows tend to have tags like:
       [ "80", "GB VRAM" ], [ "240", "GB RAM" ], [ "24", "vCPUs" ]
@@ -80,9 +103,8 @@ def _parse_tags(tag_divs) -> Dict[str, str]:
       { "GB VRAM": "80", "GB RAM": "240", "vCPUs": "24" }
     """
     out: Dict[str, str] = {}
-    for t in tag_divs:
-        parts = [_clean_text(x.get_text(" ", strip=True)) for x in t.select("div")]
-        parts = [p for p in parts if p]
+    for parts in tag_parts:
+        parts = [p for p in map(_clean_text, parts) if p]
         if len(parts) >= 2:
             value = parts[0]
             label = parts[1]
@@ -111,7 +133,7 @@ def _extract_normalized_fields(tags: Dict[str, str]) -> Dict[str, Any]:
     return norm
 
 
-@dataclass
+@dataclass(slots=True)
 class RunPodGpuRow:
     provider: str = "runpod"
     product: str = ""
@@ -119,31 +141,97 @@ class RunPodGpuRow:
     vram_gb: Optional[float] = None
     vcpus: Optional[int] = None
     system_ram_gb: Optional[float] = None
-    local_storage_tb: Optional[float] = None
+    # None for every provider here; kept class-level so rows don't carry a slot for it
+    local_storage_tb: ClassVar[None] = None
     price_per_hour_usd: Optional[float] = None
 
 
-def parse_runpod_pricing(html: str) -> List[RunPodGpuRow]:
-    soup = BeautifulSoup(html, "html.parser")
+# Unified schema column order; local_storage_tb is read off the class by attrgetter
+_FIELDS = (
+    "provider",
+    "product",
+    "gpu_count",
+    "vram_gb",
+    "vcpus",
+    "system_ram_gb",
+    "local_storage_tb",
+    "price_per_hour_usd",
+)
+_row_values = attrgetter(*_FIELDS)
+
+
+def _is_pricing_row_class(value) -> bool:
+    # The strainer sees the raw class attribute (e.g. "gpu-pricing-row w-inline-block")
+    if not value:
+        return False
+    classes = value.split() if isinstance(value, str) else value
+    return "gpu-pricing-row" in classes
+
+
+_SEL_ROWS = sv.compile("a.gpu-pricing-row")
+_SEL_MODEL = sv.compile(".gpu-pricing-row__model-wrapper")
+_SEL_TAGS = sv.compile(".gpu-pricing-row__tag")
+_SEL_DIVS = sv.compile("div")
+_SEL_PRICE = sv.compile(".cc-gpu-price")
+
+# (model text, text of each tag's inner divs, secure price attr, community price attr)
+_RawRow = Tuple[str, List[List[str]], Optional[str], Optional[str]]
+
+
+def _iter_raw_rows_lexbor(html: Union[bytes, str]) -> Iterator[_RawRow]:
+    tree = LexborHTMLParser(html)
+    for a in tree.css("a.gpu-pricing-row"):
+        model_el = a.css_first(".gpu-pricing-row__model-wrapper")
+        # Node.css() includes the node itself when it matches, BeautifulSoup's select() does not
+        tag_parts = [
+            [d.text(separator=" ", strip=True) for d in t.css("div") if d != t]
+            for t in a.css(".gpu-pricing-row__tag")
+        ]
+        price_el = a.css_first(".cc-gpu-price")
+        attrs = price_el.attributes if price_el else {}
+        yield (
+            model_el.text(separator=" ", strip=True) if model_el else "",
+            tag_parts,
+            attrs.get("data-secure-cloud-price"),
+            attrs.get("data-community-cloud-price"),
+        )
+
+
+def _iter_raw_rows_bs4(html: Union[bytes, str]) -> Iterator[_RawRow]:
+    # Only build Tag objects for the pricing rows; the rest of the page is skipped
+    strainer = SoupStrainer("a", class_=_is_pricing_row_class)
+    soup = BeautifulSoup(html, "lxml", parse_only=strainer)
+
+    for a in _SEL_ROWS.select(soup):
+        model_el = _SEL_MODEL.select_one(a)
+        tag_parts = [[x.get_text(" ", strip=True) for x in _SEL_DIVS.select(t)] for t in _SEL_TAGS.select(a)]
+        price_el = _SEL_PRICE.select_one(a)
+        yield (
+            model_el.get_text(" ", strip=True) if model_el else "",
+            tag_parts,
+            price_el.get("data-secure-cloud-price") if price_el else None,
+            price_el.get("data-community-cloud-price") if price_el else None,
+        )
+
+
+def parse_runpod_pricing(html: Union[bytes, str]) -> List[RunPodGpuRow]:
+    raw_rows = _iter_raw_rows_lexbor(html) if LexborHTMLParser is not None else _iter_raw_rows_bs4(html)
 
     rows: List[RunPodGpuRow] = []
 
     # Each GPU row is an <a class="gpu-pricing-row ...">
-    for a in soup.select("a.gpu-pricing-row"):
-        model_el = a.select_one(".gpu-pricing-row__model-wrapper")
-        gpu_model = _clean_text(model_el.get_text(" ", strip=True)) if model_el else ""
+    for model_text, tag_parts, secure_attr, community_attr in raw_rows:
+        gpu_model = _clean_text(model_text)
         if not gpu_model:
             continue
 
         # Tags like VRAM/RAM/vCPUs
-        tag_divs = a.select(".gpu-pricing-row__tag")
-        tags = _parse_tags(tag_divs)
+        tags = _parse_tags(tag_parts)
         norm = _extract_normalized_fields(tags)
 
         # Price element has attributes for both price modes (use secure_price if available, else community)
-        price_el = a.select_one(".cc-gpu-price")
-        secure_price = _to_float(price_el.get("data-secure-cloud-price")) if price_el else None
-        community_price = _to_float(price_el.get("data-community-cloud-price")) if price_el else None
+        secure_price = _to_float(secure_attr)
+        community_price = _to_float(community_attr)
         price_per_hour_usd = secure_price or community_price  # Prefer secure pricing
 
         # Extract vCPUs as integer
@@ -172,18 +260,24 @@ def parse_runpod_pricing(html: str) -> List[RunPodGpuRow]:
 # ----------------------------
 # Writers
 # ----------------------------
-def write_json(path: str, rows: List[RunPodGpuRow]) -> None:
+def write_json(path: str, values: List[tuple]) -> None:
+    # Build the dicts from _FIELDS: dataclass serialization would drop the ClassVar column
+    records = [dict(zip(_FIELDS, v)) for v in values]
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+
     with open(path, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in rows], f, indent=2, ensure_ascii=False)
+        json.dump(records, f, indent=2, ensure_ascii=False)
 
 
-def write_csv(path: str, rows: List[RunPodGpuRow]) -> None:
-    fieldnames = ["provider", "product", "gpu_count", "vram_gb", "vcpus", "system_ram_gb", "local_storage_tb", "price_per_hour_usd"]
+def write_csv(path: str, values: List[tuple]) -> None:
+    # `values`: rows flattened to _FIELDS tuples (see _row_values), shared with write_json
     with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(asdict(r))
+        w = csv.writer(f)
+        w.writerow(_FIELDS)
+        w.writerows(values)
 
 
 # ----------------------------
@@ -198,10 +292,16 @@ def scrape(url: str, out_csv: str, out_json: str):
         out_csv: Output CSV file path
         out_json: Output JSON file path
     """
-    html = load_html_from_url(url)
-    rows = parse_runpod_pricing(html)
-    write_csv(out_csv, rows)
-    write_json(out_json, rows)
+    page = _http.get(url, headers=_HEADERS)
+    if _http.is_current(page, __file__, out_csv, out_json):
+        # Page unchanged and the outputs are the ones written from it last run
+        return
+    rows = parse_runpod_pricing(page.content)
+    # Flatten each row once and hand the same tuples to both writers
+    values = list(map(_row_values, rows))
+    write_csv(out_csv, values)
+    write_json(out_json, values)
+    _http.commit(page, __file__, out_csv, out_json)
 
 
 def main() -> None:
@@ -217,8 +317,9 @@ def main() -> None:
 
     rows = parse_runpod_pricing(html)
 
-    write_csv(args.out_csv, rows)
-    write_json(args.out_json, rows)
+    values = list(map(_row_values, rows))
+    write_csv(args.out_csv, values)
+    write_json(args.out_json, values)
 
     print(f"Wrote {len(rows)} rows -> {args.out_csv}, {args.out_json}")
 